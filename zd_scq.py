@@ -7,9 +7,24 @@
 # 仅用于教育和授权的安全测试目的
 
 import sys
+import copy
 import getopt
 import os
 import re
+import json
+import time
+import shlex
+import sqlite3
+import datetime
+import threading
+import collections
+import socketserver
+import http.server
+import hashlib
+import itertools
+import mmap
+import multiprocessing
+import struct
 
 # Try to import pypinyin library for Chinese character support
 # 尝试导入pypinyin库以支持中文字符处理
@@ -24,6 +39,14 @@ except ImportError:
     print("Warning: pypinyin library not installed, using built-in simple mapping")
     print("Recommend installation: pip install pypinyin")
 
+# 部分OpenSSL版本不提供md4，NTLM将使用内置实现 / Some OpenSSL builds lack md4, NTLM then uses the built-in implementation
+try:
+    hashlib.new('md4')
+
+    HAS_MD4 = True
+except ValueError:
+    HAS_MD4 = False
+
 
 def usage():
     """Display help menu / 显示帮助菜单"""
@@ -44,6 +67,33 @@ def usage():
   -q <QQ号>       QQ号 / QQ number
   -i <用户ID>     常用用户ID / Common user ID
 
+  --mutate <规则>         姓名变形规则，逗号分隔 / Name mutation rules, comma separated:
+                          case (zHANG), leet (zh4ng), leet_full (2h4n9), digit (Zhang3)
+  --mutate-limit <数量>   每个姓名组合的最大变形数量 (默认: 8) / Max mutations per name combination (default: 8)
+  --range <区间>          数字/日期区间，逗号分隔，惰性生成 / Number/date ranges, comma separated, generated lazily:
+                          0000-9999, 1960-2030, date:DDMMYYYY:1990-1999, date:MMDD,
+                          预设 / presets: years, 4digit, mmdd, ddmm
+                          含YYYY/YY的日期格式必须指定年份区间 / date formats with YYYY/YY need a year range
+  --estimate              只估算候选数量，不生成字典 / Only estimate the keyspace, do not generate
+  --policy <规则>         口令策略，可多次使用 / Password policy, repeatable:
+                          upper,lower,digit,special (必须包含 / must contain),
+                          not:<子串> (禁止包含 / forbidden substring), re:<正则> (必须匹配 / must match)
+  --hash <算法>           额外输出按哈希排序的二进制表 / Also write hash-sorted binary tables:
+                          md5, sha1, sha256, ntlm (逗号分隔 / comma separated)
+  --workers <数量>        哈希进程数 (默认: CPU核数) / Hashing processes (default: CPU count)
+  --lookup <哈希文件>     在 --table 指定的哈希表中查找，每行一个哈希 / Look up hashes (one per line) in --table
+  --table <哈希表>        用于查找的 .bin 哈希表 / The .bin hash table to search
+  --batch <目标文件>      批量生成，每行一个目标的选项 (如: -n zhang,san -b 20031205) / Batch mode, one target's options per line
+  --batch-dir <目录>      批量输出目录 (默认: batch_output) / Batch output directory (default: batch_output)
+                          共享的域名/邮箱/生日候选集只生成一次，记录在 shared.sqlite 中 /
+                          shared domain/mail/birthday candidate sets are generated once and indexed in shared.sqlite
+  --serve <地址>          启动本地生成服务 / Start the local generation service: 127.0.0.1:8765 或/or unix:/tmp/zd.sock
+                          POST /generate {"profile": {"name": "zhang,san"}, "options": {"policy": "digit"}}
+                          分块流式返回候选 / streams candidates in chunks; GET /stats 显示缓存统计 / shows cache stats
+  --cache-size <数量>     服务缓存的目标数量 (默认: 128) / Profiles cached by the service (default: 128)
+  --progress              在stderr显示进度、速度、写入量、重复率和预计剩余时间 /
+                          show progress, rate, bytes written, dup ratio and ETA on stderr
+
 姓名处理增强功能 / Enhanced Name Processing:
   - 支持拼音首字母组合 (如: zs) / Supports pinyin initial combinations (e.g., zs)
   - 支持大小写变化 (如: Zs, ZS, zs) / Supports case variations (e.g., Zs, ZS, zs)
@@ -58,6 +108,11 @@ def usage():
   python dict_generator.py -n zhang,san -b 20031205
   python dict_generator.py -n 张三 -b 20031205 -p 13912345678
   python dict_generator.py -n li.ming -b 19950316 -d www.example.com
+  python dict_generator.py -n zhang,san --range 4digit,years --estimate
+  python dict_generator.py -n zhang,san -b 20031205 --policy upper,digit,special --policy not:admin
+  python dict_generator.py -n zhang,san -b 20031205 --hash md5,ntlm
+  python dict_generator.py --lookup hashes.txt --table dict.txt.ntlm.bin
+  python dict_generator.py --batch targets.txt --batch-dir corp_dicts --policy digit
 
 生成密码示例 / Generated password examples:
   zs20031205, Zs@20031205, 20031205zs, ZS!20031205 等
@@ -142,6 +197,592 @@ class PinyinConverter:
             return result
 
 
+class NameMutator:
+    """姓名变形器 / Rule-driven case and leet mutations for name tokens"""
+
+    # 预编译的转换表（只构建一次） / Precompiled translation tables (built once)
+    LEET_TABLE = str.maketrans({'a': '4', 'e': '3', 'i': '1', 'o': '0',
+                                'A': '4', 'E': '3', 'I': '1', 'O': '0'})
+    LEET_FULL_TABLE = str.maketrans({'a': '4', 'e': '3', 'i': '1', 'o': '0', 's': '5',
+                                     't': '7', 'g': '9', 'b': '8', 'l': '1', 'z': '2',
+                                     'A': '4', 'E': '3', 'I': '1', 'O': '0', 'S': '5',
+                                     'T': '7', 'G': '9', 'B': '8', 'L': '1', 'Z': '2'})
+
+    # 末尾拼音谐音数字 (如: zhangsan -> zhang3) / Trailing pinyin numerals (e.g., zhangsan -> zhang3)
+    PINYIN_DIGITS = {'ling': '0', 'yi': '1', 'er': '2', 'san': '3', 'si': '4',
+                     'wu': '5', 'liu': '6', 'qi': '7', 'ba': '8', 'jiu': '9'}
+    PINYIN_DIGIT_RE = re.compile(r'(ling|yi|er|san|si|wu|liu|qi|ba|jiu)$', re.IGNORECASE)
+
+    # 支持的规则 / Supported rules
+    RULES = ('case', 'leet', 'leet_full', 'digit')
+
+    def __init__(self, rules, limit=8):
+        self.rules = self.check_rules(rules)
+        self.limit = limit  # 每个词元的最大变形数量 / Maximum mutations per token
+
+    @classmethod
+    def check_rules(cls, rules):
+        """校验变形规则，未知规则抛出ValueError / Validate mutation rules, raise ValueError on unknown rules"""
+        rules = [rule.strip() for rule in rules if rule.strip()]
+        unknown = [rule for rule in rules if rule not in cls.RULES]
+        if unknown:
+            raise ValueError(f'未知的变形规则 / Unknown mutation rules: {", ".join(unknown)} '
+                             f'(可选 / available: {", ".join(cls.RULES)})')
+        return rules
+
+    def _case(self, token):
+        """大小写反转 (如: Zhang -> zHANG) / Swap case (e.g., Zhang -> zHANG)"""
+        yield token.swapcase()
+
+    def _leet(self, token, table):
+        """整体替换，然后逐位单点替换 / Full substitution, then single-position substitutions"""
+        yield token.translate(table)
+        for i, char in enumerate(token):
+            leet_char = char.translate(table)
+            if leet_char != char:
+                yield token[:i] + leet_char + token[i + 1:]  # zh4ng
+
+    def _digit(self, token):
+        """末尾拼音替换为数字 / Replace trailing pinyin numeral with digit"""
+        match = self.PINYIN_DIGIT_RE.search(token)
+        if match and match.start() > 0:
+            yield token[:match.start()] + self.PINYIN_DIGITS[match.group(1).lower()]  # Zhang3
+
+    def variants(self, token, min_length, max_length, seen=None):
+        """惰性生成词元变形，长度下推且受数量上限约束 / Lazily yield token mutations with length push-down and a per-token cap
+
+        seen 为跨词元共享的已生成集合，只产出并计数新的变形 / seen is shared across tokens, only new variants are yielded and counted
+        """
+        if seen is None:
+            seen = {token}
+        count = 0
+        # 大小写和leet变形不改变长度，基础词元长度无效时整体跳过 / Case and leet keep the length, skip them when the base is out of range
+        same_length_ok = min_length <= len(token) <= max_length
+
+        for rule in self.rules:
+            if rule == 'case':
+                if not same_length_ok:
+                    continue
+                candidates = self._case(token)
+            elif rule == 'leet':
+                if not same_length_ok:
+                    continue
+                candidates = self._leet(token, self.LEET_TABLE)
+            elif rule == 'leet_full':
+                if not same_length_ok:
+                    continue
+                candidates = self._leet(token, self.LEET_FULL_TABLE)
+            else:
+                candidates = self._digit(token)
+
+            for variant in candidates:
+                if variant in seen or not (min_length <= len(variant) <= max_length):
+                    continue
+                seen.add(variant)
+                yield variant
+                count += 1
+                if count >= self.limit:
+                    return
+
+
+class NumberRange:
+    """数字区间生成器 / Lazy numeric token generator for a compact range spec"""
+
+    def __init__(self, start, end, width=0):
+        if start > end:
+            raise ValueError(f'数字区间起点大于终点 / Range start is greater than end: {start}-{end}')
+        self.start = start
+        self.end = end
+        self.width = width  # 补零宽度，0表示不补零 / Zero-padding width, 0 means no padding
+
+    @classmethod
+    def parse(cls, spec):
+        """解析区间描述 (如: 0000-9999, 1960-2030) / Parse a range spec (e.g., 0000-9999, 1960-2030)"""
+        match = re.fullmatch(r'(\d+)-(\d+)', spec)
+        if not match:
+            raise ValueError(f'数字区间格式错误 / Number range format error: {spec}')
+        start_text, end_text = match.groups()
+        # 起止位数相同时补零 (0000-9999) / Zero-pad when both ends have the same width (0000-9999)
+        width = len(end_text) if len(start_text) == len(end_text) else 0
+        return cls(int(start_text), int(end_text), width)
+
+    def __len__(self):
+        return self.end - self.start + 1
+
+    def __iter__(self):
+        return self.iter_within(0, self.max_length)
+
+    @property
+    def min_length(self):
+        return max(len(str(self.start)), self.width)
+
+    @property
+    def max_length(self):
+        return max(len(str(self.end)), self.width)
+
+    def _bounds(self, min_length, max_length):
+        """按长度下推裁剪区间 / Clip the range to the pushed-down length bounds"""
+        if max_length < self.min_length or min_length > self.max_length:
+            return self.start, self.start - 1
+        if self.width:
+            return self.start, self.end
+        # 不补零时长度随数值增长 / Without padding the length grows with the value
+        low = max(self.start, 10 ** (min_length - 1) if min_length > 1 else 0)
+        high = min(self.end, 10 ** max_length - 1)
+        return low, high
+
+    def iter_within(self, min_length, max_length):
+        """惰性生成长度在范围内的数字 / Lazily yield numbers whose length is within bounds"""
+        low, high = self._bounds(min_length, max_length)
+        number_format = f'0{self.width}d' if self.width else 'd'
+        for number in range(low, high + 1):
+            yield format(number, number_format)
+
+    def count_within(self, min_length, max_length):
+        """不生成即计数 / Count without generating"""
+        low, high = self._bounds(min_length, max_length)
+        return max(0, high - low + 1)
+
+
+class DateRange:
+    """日期区间生成器 / Lazy date token generator for a format and year range"""
+
+    def __init__(self, date_format, first_year=2000, last_year=2000):
+        date_format = date_format.upper()
+        if not re.fullmatch(r'(YYYY|YY|MM|DD)+', date_format):
+            raise ValueError(f'日期格式错误，只支持YYYY/YY/MM/DD / Date format error, only YYYY/YY/MM/DD supported: {date_format}')
+        fields = [field[:2] for field in re.findall(r'YYYY|YY|MM|DD', date_format)]
+        if len(set(fields)) != len(fields):
+            raise ValueError(f'日期格式字段重复 / Date format repeats a field: {date_format}')
+        if 'DD' in fields and 'MM' not in fields:
+            raise ValueError(f'含DD的日期格式必须包含MM / Date formats with DD need MM: {date_format}')
+        if not 1000 <= first_year <= last_year <= 9999:
+            raise ValueError(f'年份区间错误 / Year range error: {first_year}-{last_year}')
+        if 'Y' not in date_format:
+            # 无年份时只取闰年，覆盖0229 / Without a year use one leap year so 0229 is covered
+            first_year = last_year = 2000
+        elif 'YYYY' not in date_format and last_year - first_year >= 100:
+            raise ValueError(f'YY格式年份区间不能超过100年 / YY year range cannot exceed 100 years: {first_year}-{last_year}')
+        self.date_format = date_format
+        self.strftime_format = (date_format.replace('YYYY', '%Y').replace('YY', '%y')
+                                .replace('MM', '%m').replace('DD', '%d'))
+        # 按格式中最细的单位步进 / Step by the finest unit present in the format
+        self.unit = 'day' if 'DD' in date_format else 'month' if 'MM' in date_format else 'year'
+        self.first_year = first_year
+        self.last_year = last_year
+        self.first = datetime.date(first_year, 1, 1)
+        self.last = datetime.date(last_year, 12, 31)
+        # 所有日期长度相同 / Every date renders to the same length
+        self.min_length = self.max_length = len(self.first.strftime(self.strftime_format))
+
+    def __len__(self):
+        years = self.last_year - self.first_year + 1
+        if self.unit == 'year':
+            return years
+        if self.unit == 'month':
+            return years * 12
+        return (self.last - self.first).days + 1
+
+    def __iter__(self):
+        return self.iter_within(0, self.max_length)
+
+    def iter_within(self, min_length, max_length):
+        """惰性生成日期字符串 / Lazily yield date strings"""
+        if not min_length <= self.max_length <= max_length:
+            return
+        if self.unit != 'day':
+            months = range(1, 13) if self.unit == 'month' else (1,)
+            for year in range(self.first_year, self.last_year + 1):
+                for month in months:
+                    yield datetime.date(year, month, 1).strftime(self.strftime_format)
+            return
+        one_day = datetime.timedelta(days=1)
+        day = self.first
+        while day <= self.last:
+            yield day.strftime(self.strftime_format)
+            day += one_day
+
+    def count_within(self, min_length, max_length):
+        """不生成即计数 / Count without generating"""
+        return len(self) if min_length <= self.max_length <= max_length else 0
+
+
+# 常用区间预设 / Common range presets
+RANGE_PRESETS = {
+    'years': '1960-2030',  # 年份 / Years
+    '4digit': '0000-9999',  # 所有4位数字 / All 4-digit suffixes
+    'mmdd': 'date:MMDD',  # 所有月日 / Every month-day
+    'ddmm': 'date:DDMM',  # 所有日月 / Every day-month
+}
+
+
+def parse_range_spec(spec):
+    """解析区间描述为惰性生成器 / Parse a range spec into a lazy token generator
+
+    支持 / Supported: 0000-9999, 1960-2030, date:DDMMYYYY:1990-1999, date:MMDD, 以及预设 / and presets
+    """
+    spec = RANGE_PRESETS.get(spec.lower(), spec)
+    if not spec.lower().startswith('date:'):
+        return NumberRange.parse(spec)
+
+    parts = spec.split(':')
+    if len(parts) == 2:
+        if 'Y' in parts[1].upper():
+            raise ValueError(f'含年份的日期格式必须指定年份区间 / Date formats with YYYY/YY need a year range: {spec}')
+        return DateRange(parts[1])
+    match = re.fullmatch(r'(\d{4})-(\d{4})', parts[2]) if len(parts) == 3 else None
+    if not match:
+        raise ValueError(f'日期区间格式错误 / Date range format error: {spec}')
+    return DateRange(parts[1], int(match.group(1)), int(match.group(2)))
+
+
+class PasswordPolicy:
+    """口令策略预过滤器 / Password policy prefilter"""
+
+    # 字符类别位掩码 / Character class bit masks
+    UPPER, LOWER, DIGIT, SPECIAL = 1, 2, 4, 8
+    CLASS_NAMES = {'upper': UPPER, 'lower': LOWER, 'digit': DIGIT, 'special': SPECIAL}
+    CLASS_PATTERNS = [(UPPER, re.compile(r'[A-Z]')), (LOWER, re.compile(r'[a-z]')),
+                      (DIGIT, re.compile(r'[0-9]')), (SPECIAL, re.compile(r'[^0-9A-Za-z]'))]
+
+    def __init__(self):
+        self.required = 0  # 必须包含的字符类别 / Required character classes
+        self.forbidden = []  # 禁止的子串（不区分大小写） / Forbidden substrings (case-insensitive)
+        self.patterns = []  # 必须匹配的正则 / Regexes that must match
+        self._class_cache = {}
+
+    def __bool__(self):
+        return bool(self.required or self.forbidden or self.patterns)
+
+    def add_rules(self, spec):
+        """解析策略规则 (如: upper,digit,special,not:admin,re:^[A-Z]) / Parse policy rules (e.g., upper,digit,special,not:admin,re:^[A-Z])"""
+        rest = spec
+        while rest:
+            # 正则可能包含逗号，占用剩余全部内容 / A regex may contain commas, so it takes the rest of the spec
+            if rest.startswith('re:'):
+                try:
+                    self.patterns.append(re.compile(rest[3:]))
+                except re.error as err:
+                    raise ValueError(f'策略正则错误 / Policy regex error: {err}')
+                return
+            rule, _, rest = rest.partition(',')
+            rule = rule.strip()
+            if rule.lower() in self.CLASS_NAMES:
+                self.required |= self.CLASS_NAMES[rule.lower()]
+            elif rule.startswith('not:') and len(rule) > 4:
+                self.forbidden.append(rule[4:].lower())
+            elif rule:
+                raise ValueError(f'未知的策略规则 / Unknown policy rule: {rule} '
+                                 f'(可选 / available: {", ".join(self.CLASS_NAMES)}, not:<子串/substring>, re:<正则/regex>)')
+
+    def _classes(self, text):
+        """计算字符类别掩码 / Character class mask of a string"""
+        mask = 0
+        for class_bit, pattern in self.CLASS_PATTERNS:
+            if pattern.search(text):
+                mask |= class_bit
+        return mask
+
+    def classes_of(self, token):
+        """词元的字符类别掩码（带缓存，只用于词元） / Character class mask of a token (cached, tokens only)"""
+        mask = self._class_cache.get(token)
+        if mask is None:
+            mask = self._class_cache[token] = self._classes(token)
+        return mask
+
+    def allows_token(self, token):
+        """词元不含禁止子串 / Token contains no forbidden substring"""
+        lowered = token.lower()
+        return not any(word in lowered for word in self.forbidden)
+
+    def reachable(self, mask):
+        """给定类别掩码能否满足类别要求 / Whether a class mask covers the required classes"""
+        return mask & self.required == self.required
+
+    def accepts(self, password):
+        """逐条检查完整候选 / Check a complete candidate"""
+        return (self.reachable(self._classes(password))
+                and self.allows_token(password)
+                and all(pattern.search(password) for pattern in self.patterns))
+
+
+# 哈希表参数 / Hash table parameters
+HASH_DIGEST_SIZES = {'md5': 16, 'sha1': 20, 'sha256': 32, 'ntlm': 16}
+HASH_MAGIC = b'ZDH1'
+HASH_HEADER = struct.Struct('<4s8sBBQ')  # 魔数、算法、摘要长度、候选宽度、记录数 / Magic, algorithm, digest size, candidate width, record count
+HASH_BATCH_SIZE = 10000  # 每批交给子进程的候选数量 / Candidates per worker batch
+
+
+def _md4(data):
+    """纯Python MD4实现 / Pure-Python MD4 implementation"""
+    mask = 0xffffffff
+
+    def rotl(value, shift):
+        return ((value << shift) | (value >> (32 - shift))) & mask
+
+    message = bytearray(data)
+    message.append(0x80)
+    message.extend(b'\x00' * ((56 - len(message) % 64) % 64))
+    message.extend(struct.pack('<Q', len(data) * 8))
+
+    h = [0x67452301, 0xefcdab89, 0x98badcfe, 0x10325476]
+    for offset in range(0, len(message), 64):
+        x = struct.unpack('<16I', message[offset:offset + 64])
+        a, b, c, d = h
+        for i in range(16):  # 第一轮 / Round 1
+            a = rotl((a + ((b & c) | (~b & d)) + x[i]) & mask, (3, 7, 11, 19)[i % 4])
+            a, b, c, d = d, a, b, c
+        for i in range(16):  # 第二轮 / Round 2
+            k = (i % 4) * 4 + i // 4
+            a = rotl((a + ((b & c) | (b & d) | (c & d)) + x[k] + 0x5a827999) & mask, (3, 5, 9, 13)[i % 4])
+            a, b, c, d = d, a, b, c
+        for i in range(16):  # 第三轮 / Round 3
+            k = (0, 8, 4, 12, 2, 10, 6, 14, 1, 9, 5, 13, 3, 11, 7, 15)[i]
+            a = rotl((a + (b ^ c ^ d) + x[k] + 0x6ed9eba1) & mask, (3, 9, 11, 15)[i % 4])
+            a, b, c, d = d, a, b, c
+        h = [(value + delta) & mask for value, delta in zip(h, (a, b, c, d))]
+
+    return struct.pack('<4I', *h)
+
+
+def hash_password(algorithm, password):
+    """计算单个候选的哈希摘要 / Hash a single candidate"""
+    if algorithm == 'ntlm':
+        data = password.encode('utf-16-le')
+        return hashlib.new('md4', data).digest() if HAS_MD4 else _md4(data)
+    return hashlib.new(algorithm, password.encode('utf-8')).digest()
+
+
+def _hash_batch(job):
+    """子进程：批量计算哈希 / Worker: hash one batch for every algorithm"""
+    algorithms, batch = job
+    return {algorithm: [hash_password(algorithm, password) + password.encode('utf-8') for password in batch]
+            for algorithm in algorithms}
+
+
+def write_hash_table(path, algorithm, records):
+    """写出按哈希排序的定长记录表 / Write a hash-sorted table of fixed-size records
+
+    记录格式 / Record layout: 摘要/digest + 候选长度/length (1 byte) + 候选/candidate (补零到宽度 / zero-padded to width)
+    """
+    digest_size = HASH_DIGEST_SIZES[algorithm]
+    records.sort()  # 摘要在前，按字节排序即按哈希排序 / Digest comes first, so byte order is hash order
+    width = max((len(record) - digest_size for record in records), default=0)
+
+    with open(path, 'wb') as f:
+        f.write(HASH_HEADER.pack(HASH_MAGIC, algorithm.encode('ascii'), digest_size, width, len(records)))
+        for record in records:
+            candidate = record[digest_size:]
+            f.write(record[:digest_size] + bytes([len(candidate)]) + candidate.ljust(width, b'\x00'))
+
+
+class HashTable:
+    """按哈希排序的二进制表，二分查找 / Hash-sorted binary table with binary-search lookup"""
+
+    def __init__(self, path):
+        self._file = open(path, 'rb')
+        header = self._file.read(HASH_HEADER.size)
+        if len(header) != HASH_HEADER.size or header[:4] != HASH_MAGIC:
+            self._file.close()
+            raise ValueError(f'不是有效的哈希表文件 / Not a valid hash table file: {path}')
+
+        magic, algorithm, self.digest_size, self.width, self.count = HASH_HEADER.unpack(header)
+        self.algorithm = algorithm.rstrip(b'\x00').decode('ascii')
+        self.record_size = self.digest_size + 1 + self.width
+        self._data = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def close(self):
+        self._data.close()
+        self._file.close()
+
+    def _offset(self, index):
+        return HASH_HEADER.size + index * self.record_size
+
+    def _digest_at(self, index):
+        offset = self._offset(index)
+        return self._data[offset:offset + self.digest_size]
+
+    def find(self, digest):
+        """二分查找，返回所有匹配的候选 / Binary search, returns every matching candidate"""
+        low, high = 0, self.count
+        while low < high:
+            middle = (low + high) // 2
+            if self._digest_at(middle) < digest:
+                low = middle + 1
+            else:
+                high = middle
+
+        matches = []
+        while low < self.count and self._digest_at(low) == digest:
+            offset = self._offset(low) + self.digest_size
+            length = self._data[offset]
+            matches.append(self._data[offset + 1:offset + 1 + length].decode('utf-8'))
+            low += 1
+        return matches
+
+
+class ProgressReporter:
+    """生成进度显示（stderr，低频刷新） / Generation progress on stderr, refreshed at low frequency"""
+
+    REFRESH_INTERVAL = 0.5  # 最短刷新间隔（秒） / Minimum seconds between redraws
+    CHUNK_SIZE = 4096  # 每批计数的候选数量，批间才读时钟 / Candidates counted per batch, the clock is only read between batches
+
+    def __init__(self, keyspace, stream=None):
+        self.stream = stream or sys.stderr
+        self.phase_sizes = dict(keyspace)  # 各阶段的估算数量 / Estimated size of every phase
+        self.total = sum(self.phase_sizes.values())
+        self.generated = 0
+        self.written = 0
+        self.bytes_written = 0
+        self.phase = ''
+        self.phase_size = 0
+        self.phase_start = 0  # 阶段开始时的已生成数量 / Generated count when the phase started
+        self.finished_estimate = 0  # 已完成阶段的估算数量之和 / Estimated size of completed phases
+        self.started = time.monotonic()
+        self.last_draw = 0.0
+        self.line_width = 0
+
+    @staticmethod
+    def _format_duration(seconds):
+        minutes, seconds = divmod(int(seconds), 60)
+        hours, minutes = divmod(minutes, 60)
+        return f"{hours:02d}:{minutes:02d}:{seconds:02d}"
+
+    def _write(self, line):
+        self.stream.write('\r' + line.ljust(self.line_width))
+        self.stream.flush()
+        self.line_width = len(line)
+        self.last_draw = time.monotonic()
+
+    def _end_line(self):
+        if self.line_width:
+            self.stream.write('\n')
+            self.stream.flush()
+            self.line_width = 0
+
+    def _switch_phase(self, name):
+        if self.phase:
+            self.draw()
+            self._end_line()
+            self.finished_estimate += self.phase_size
+        self.phase = name
+        self.phase_size = self.phase_sizes.get(name, 0)
+        self.phase_start = self.generated
+
+    def start_phase(self, name):
+        """进入新阶段 / Enter a new phase"""
+        self._switch_phase(name)
+        self.draw()
+
+    def add(self, generated, written, bytes_written):
+        """累加一批的计数，到达刷新间隔才重绘 / Add one batch of counts, redraw only after the refresh interval"""
+        self.generated += generated
+        self.written += written
+        self.bytes_written += bytes_written
+        if time.monotonic() - self.last_draw >= self.REFRESH_INTERVAL:
+            self.draw()
+
+    def draw(self):
+        """显示已生成数量、速度、写入量和预计剩余时间 / Show generated count, rate, bytes written and ETA"""
+        elapsed = max(time.monotonic() - self.started, 1e-6)
+        rate = self.generated / elapsed
+        phase_done = self.generated - self.phase_start
+        # 策略剪枝和长度下推会少于估算，剩余量按估算上限计 / Pruning may yield less than estimated, remaining uses the upper bound
+        remaining = max(self.total - self.finished_estimate - min(phase_done, self.phase_size), 0)
+        eta = self._format_duration(remaining / rate) if rate else '--:--:--'
+        percent = min(phase_done / self.phase_size * 100, 100) if self.phase_size else 100
+        self._write(f"[{self.phase} {percent:3.0f}%] {self.generated:,} 生成/generated  {rate:,.0f}/s  "
+                    f"{self.bytes_written / 1048576:.1f} MB  ETA {eta}")
+
+    def dedup(self, processed, unique, total, force=False):
+        """去重进度和重复率 / Deduplication progress and duplicate ratio"""
+        if not force and time.monotonic() - self.last_draw < self.REFRESH_INTERVAL:
+            return
+        if self.phase != 'dedup':
+            self._switch_phase('dedup')  # 去重行由下方绘制 / The dedup line is drawn below
+        duplicate_ratio = 1 - unique / processed if processed else 0
+        percent = processed / total * 100 if total else 100
+        self._write(f"[去重/dedup {percent:3.0f}%] {processed:,}/{total:,}  重复率/dup ratio {duplicate_ratio:.1%}")
+
+    def finish(self, unique):
+        """输出汇总 / Print the summary"""
+        self._end_line()
+        elapsed = time.monotonic() - self.started
+        duplicate_ratio = 1 - unique / self.written if self.written else 0
+        self.stream.write(f"生成 {self.generated:,} / 写入 {self.written:,} / 去重后 {unique:,} (重复率 {duplicate_ratio:.1%})，"
+                          f"用时 {self._format_duration(elapsed)} / Generated {self.generated:,}, written {self.written:,}, "
+                          f"unique {unique:,} (dup ratio {duplicate_ratio:.1%}) in {self._format_duration(elapsed)}\n")
+        self.stream.flush()
+
+
+class Profile:
+    """目标信息 / Target profile
+
+    所有字段均为字符串或None / Every field is a string or None
+    """
+
+    __slots__ = ('name', 'birthday', 'id_card', 'mail', 'domain', 'phone_number', 'qq_number', 'user_id')
+
+    # 字段校验规则 / Field validation rules
+    RULES = {
+        'birthday': (lambda value: len(value) == 8 and value.isdigit(),
+                     '生日格式错误，应为8位数字 (如: 20031205) / Birthday format error, should be 8 digits (e.g., 20031205)'),
+        'id_card': (lambda value: len(value) == 18,
+                    '身份证号格式错误，应为18位 / ID card format error, should be 18 digits'),
+        'mail': (lambda value: '@' in value,
+                 '邮箱格式错误 / Email format error'),
+        'phone_number': (lambda value: len(value) == 11 and value.isdigit(),
+                         '手机号格式错误，应为11位数字 / Phone number format error, should be 11 digits'),
+        'qq_number': (lambda value: value.isdigit(),
+                      'QQ号格式错误，应为纯数字 / QQ number format error, should be digits only'),
+    }
+
+    def __init__(self, name=None, birthday=None, id_card=None, mail=None, domain=None,
+                 phone_number=None, qq_number=None, user_id=None):
+        self.name = self.check('name', name)
+        self.birthday = self.check('birthday', birthday)
+        self.id_card = self.check('id_card', id_card)
+        self.mail = self.check('mail', mail)
+        self.domain = self.check('domain', domain)
+        self.phone_number = self.check('phone_number', phone_number)
+        self.qq_number = self.check('qq_number', qq_number)
+        self.user_id = self.check('user_id', user_id)
+
+    @classmethod
+    def check(cls, field, value):
+        """校验单个字段，格式错误时抛出ValueError / Validate one field, raise ValueError on format errors"""
+        if value is None:
+            return value
+        if not isinstance(value, str):
+            raise ValueError(f'{field} 应为字符串 / {field} should be a string')
+        rule = cls.RULES.get(field)
+        if rule and not rule[0](value):
+            raise ValueError(rule[1])
+        return value
+
+    def _values(self):
+        return tuple(getattr(self, field) for field in self.__slots__)
+
+    def __bool__(self):
+        return any(self._values())
+
+    def __eq__(self, other):
+        return isinstance(other, Profile) and self._values() == other._values()
+
+    def __hash__(self):
+        return hash(self._values())
+
+    def __repr__(self):
+        fields = ', '.join(f'{field}={getattr(self, field)!r}' for field in self.__slots__ if getattr(self, field))
+        return f'Profile({fields})'
+
+
 class DictGenerator:
     """密码字典生成器主类 / Main password dictionary generator class"""
 
@@ -167,6 +808,19 @@ class DictGenerator:
         self.name_initials = ""  # 首字母缩写 / Initial abbreviation
         self.name_combinations = []  # 各种姓名组合 / Various name combinations
 
+        # 其他处理后的词元 / Other processed tokens
+        self.birthday_list = []  # 生日片段 / Birthday segments
+        self.domain_list = []  # 域名片段 / Domain segments
+        self.mail_list = []  # 邮箱片段 / Email segments
+
+        # 输出处理过程信息（库调用时关闭） / Print processing details (off for library calls)
+        self.verbose = True
+
+        # 姓名变形阶段（可选） / Name mutation stage (optional)
+        self.mutation_rules = []  # 变形规则 / Mutation rules
+        self.mutation_limit = 8  # 每个姓名组合的最大变形数量 / Maximum mutations per name combination
+        self.mutator = None
+
         # 特殊符号 / Special characters
         self.special_chars = ["@", "!", "*", "#", "$", "%", "&", "+", "=", "?", "~"]
 
@@ -188,6 +842,35 @@ class DictGenerator:
                                "1234", "1314", "5201314", "1212", "1111",
                                "0000", "123456789", "123123123"]
 
+        # 数字区间（惰性生成，不展开为列表） / Number ranges (generated lazily, never expanded into lists)
+        self.number_ranges = []
+
+        # 只估算候选数量，不生成 / Only estimate the keyspace, do not generate
+        self.estimate_only = False
+
+        # 口令策略（字符类别、禁止子串、正则） / Password policy (character classes, forbidden substrings, regex)
+        self.policy = PasswordPolicy()
+
+        # 哈希预计算与查找 / Hash precompute and lookup
+        self.hash_algorithms = []  # 输出哈希表的算法 / Algorithms to write hash tables for
+        self.hash_workers = os.cpu_count() or 1  # 哈希进程数 / Hashing processes
+        self.lookup_file = None  # 待查找的哈希文件 / File of hashes to look up
+        self.lookup_table = None  # 用于查找的哈希表 / Hash table to search
+
+        # 批量生成与共享候选集 / Batch generation and shared candidate sets
+        self.batch_file = None  # 目标列表文件 / Targets file
+        self.batch_dir = "batch_output"  # 批量输出目录 / Batch output directory
+        self.shared_tokens = set()  # 由共享集提供、本目标跳过的词元 / Tokens served by shared sets, skipped for this target
+        self.exclude_passwords = set()  # 去重时排除的候选 / Candidates dropped during deduplication
+
+        # 本地生成服务 / Local generation service
+        self.serve_address = None  # host:port 或 / or unix:/path
+        self.cache_size = 128  # 缓存的目标数量 / Number of cached profiles
+
+        # 进度显示 / Progress display
+        self.show_progress = False
+        self.progress = None
+
         # 常用弱密码 / Common weak passwords
         self.weak_password = ["qwerty", "qwert", "abc", "qazwsx",
                               "1q2w3e4r", "abcd", "qwer", "qwe", "love",
@@ -199,58 +882,172 @@ class DictGenerator:
         """检查密码长度是否有效 / Check if password length is valid"""
         return self.min_length <= len(password) <= self.max_length
 
-    def parse_args(self):
-        """解析命令行参数 / Parse command line arguments"""
+    def is_valid_password(self, password):
+        """检查长度和口令策略 / Check length and password policy"""
+        return self.is_valid_length(password) and (not self.policy or self.policy.accepts(password))
+
+    def policy_allows(self, *tokens, extra_classes=0):
+        """计划层剪枝：这些词元拼接后能否满足策略 / Plan-level pruning: whether concatenating these tokens can pass the policy"""
+        if not self.policy:
+            return True
+        classes = extra_classes
+        for token in tokens:
+            if not self.policy.allows_token(token):
+                return False
+            classes |= self.policy.classes_of(token)
+        return self.policy.reachable(classes)
+
+    # 目标信息选项，批量文件的行只允许这些 / Target information options, the only ones allowed on batch lines
+    TARGET_OPTIONS = ('-n', '-b', '-c', '-m', '-d', '-p', '-q', '-i')
+    # 运行模式选项，只能在命令行使用 / Run mode options, command line only
+    MODE_OPTIONS = ('-h', '--batch', '--serve', '--lookup', '--table')
+
+    def parse_args(self, argv=None, target_only=False):
+        """解析命令行参数 / Parse command line arguments
+
+        target_only 为真时只接受目标信息选项（批量文件的行） / With target_only only target information options are accepted (batch lines)
+        """
         try:
-            opts, args = getopt.getopt(sys.argv[1:], "hn:b:c:m:d:p:q:i:")
+            opts, args = getopt.getopt(sys.argv[1:] if argv is None else argv, "hn:b:c:m:d:p:q:i:",
+                                       ["mutate=", "mutate-limit=", "range=", "estimate", "policy=",
+                                        "hash=", "workers=", "lookup=", "table=", "batch=", "batch-dir=",
+                                        "serve=", "cache-size=", "progress"])
         except getopt.GetoptError as err:
+            # 显式传入的参数（如批量文件中的行）交由调用方处理 / Explicit argv (e.g. a batch line) is left to the caller
+            if argv is not None:
+                raise ValueError(f'参数错误 / Option error: {err}') from err
             print(f"错误 / Error: {err}")
             usage()
             sys.exit(2)
 
         for options, value in opts:
+            if argv is not None and options in self.MODE_OPTIONS:
+                raise ValueError(f'{options} 只能在命令行使用 / {options} is only allowed on the command line')
+            if target_only and options not in self.TARGET_OPTIONS:
+                raise ValueError(f'{options} 为全局选项，不能用于单个目标 / {options} is a global option, not allowed per target')
             if options == "-h":
                 usage()
                 sys.exit()
             elif options == "-n":
                 self.name = value
             elif options == "-b":
-                if len(value) == 8 and value.isdigit():
-                    self.birthday = value
-                else:
-                    raise ValueError(
-                        '生日格式错误，应为8位数字 (如: 20031205) / Birthday format error, should be 8 digits (e.g., 20031205)')
+                self.birthday = Profile.check('birthday', value)
             elif options == "-c":
-                if len(value) == 18:
-                    self.id_card = value
-                else:
-                    raise ValueError('身份证号格式错误，应为18位 / ID card format error, should be 18 digits')
+                self.id_card = Profile.check('id_card', value)
             elif options == "-m":
-                if '@' in value:
-                    self.mail = value
-                else:
-                    raise ValueError('邮箱格式错误 / Email format error')
+                self.mail = Profile.check('mail', value)
             elif options == "-d":
                 self.domain = value
             elif options == "-p":
-                if len(value) == 11 and value.isdigit():
-                    self.phone_number = value
-                else:
-                    raise ValueError('手机号格式错误，应为11位数字 / Phone number format error, should be 11 digits')
+                self.phone_number = Profile.check('phone_number', value)
             elif options == "-q":
-                if value.isdigit():
-                    self.qq_number = value
-                else:
-                    raise ValueError('QQ号格式错误，应为纯数字 / QQ number format error, should be digits only')
+                self.qq_number = Profile.check('qq_number', value)
             elif options == "-i":
                 self.user_id = value
+            elif options == "--mutate":
+                self.mutation_rules = NameMutator.check_rules(value.split(','))
+            elif options == "--mutate-limit":
+                if value.isdigit() and int(value) > 0:
+                    self.mutation_limit = int(value)
+                else:
+                    raise ValueError('变形数量上限应为正整数 / Mutation limit should be a positive integer')
+            elif options == "--range":
+                self.number_ranges.extend(parse_range_spec(spec.strip()) for spec in value.split(',') if spec.strip())
+            elif options == "--estimate":
+                self.estimate_only = True
+            elif options == "--policy":
+                self.policy.add_rules(value)
+            elif options == "--hash":
+                self.hash_algorithms = [algorithm.strip().lower() for algorithm in value.split(',') if algorithm.strip()]
+                unknown = [algorithm for algorithm in self.hash_algorithms if algorithm not in HASH_DIGEST_SIZES]
+                if unknown:
+                    raise ValueError(f'不支持的哈希算法 / Unsupported hash algorithms: {", ".join(unknown)} '
+                                     f'(可选 / available: {", ".join(HASH_DIGEST_SIZES)})')
+            elif options == "--workers":
+                if value.isdigit() and int(value) > 0:
+                    self.hash_workers = int(value)
+                else:
+                    raise ValueError('进程数应为正整数 / Worker count should be a positive integer')
+            elif options == "--lookup":
+                self.lookup_file = value
+            elif options == "--table":
+                self.lookup_table = value
+            elif options == "--batch":
+                self.batch_file = value
+            elif options == "--batch-dir":
+                self.batch_dir = value
+            elif options == "--serve":
+                self.serve_address = value
+            elif options == "--progress":
+                self.show_progress = True
+            elif options == "--cache-size":
+                if value.isdigit() and int(value) > 0:
+                    self.cache_size = int(value)
+                else:
+                    raise ValueError('缓存数量应为正整数 / Cache size should be a positive integer')
+
+    @classmethod
+    def from_profile(cls, profile, **opts):
+        """由目标信息和选项构建已处理的生成器 / Build a processed generator from a profile and options"""
+        generator = cls()
+        generator.verbose = False
+        generator.configure(**opts)
+        generator.load_profile(profile)
+        generator.process_profile()
+        return generator
+
+    def profile(self):
+        """当前目标信息 / Current target profile"""
+        return Profile(**{field: getattr(self, field) for field in Profile.__slots__})
+
+    def load_profile(self, profile):
+        """载入目标信息 / Load a target profile"""
+        for field in Profile.__slots__:
+            setattr(self, field, getattr(profile, field))
+
+    def configure(self, min_length=None, max_length=None, mutate=None, mutate_limit=None, ranges=None, policy=None):
+        """设置生成选项（库接口，对应命令行选项） / Set generation options (library API, mirrors the command line options)
+
+        mutate/ranges/policy 可为逗号分隔字符串或列表 / mutate/ranges/policy accept a comma separated string or a list
+        """
+        # 与命令行相同的校验 / Same checks as the command line
+        for value, message in ((min_length, '密码长度应为正整数 / Password length should be a positive integer'),
+                               (max_length, '密码长度应为正整数 / Password length should be a positive integer'),
+                               (mutate_limit, '变形数量上限应为正整数 / Mutation limit should be a positive integer')):
+            if value is not None and (isinstance(value, bool) or not isinstance(value, int) or value <= 0):
+                raise ValueError(message)
+        if (min_length or self.min_length) > (max_length or self.max_length):
+            raise ValueError('最小长度不能大于最大长度 / Minimum length cannot exceed maximum length')
+
+        if min_length is not None:
+            self.min_length = min_length
+        if max_length is not None:
+            self.max_length = max_length
+        if mutate:
+            self.mutation_rules = NameMutator.check_rules(mutate.split(',') if isinstance(mutate, str) else mutate)
+        if mutate_limit is not None:
+            self.mutation_limit = mutate_limit
+        if ranges:
+            for spec in (ranges.split(',') if isinstance(ranges, str) else ranges):
+                self.number_ranges.append(parse_range_spec(spec) if isinstance(spec, str) else spec)
+        if policy:
+            for spec in ([policy] if isinstance(policy, str) else policy):
+                self.policy.add_rules(spec)
+
+    def process_profile(self):
+        """处理各种信息 / Process all target information"""
+        self.process_name()
+        self.process_birthday()
+        self.process_domain()
+        self.process_mail()
 
     def process_name(self):
         """处理姓名信息 - 增强版 / Process name information - Enhanced version"""
         if not self.name:
             return
 
-        print(f"正在处理姓名 / Processing name: {self.name}")
+        if self.verbose:
+            print(f"正在处理姓名 / Processing name: {self.name}")
 
         # 判断输入格式 / Determine input format
         if ',' in self.name or '.' in self.name:
@@ -263,7 +1060,8 @@ class DictGenerator:
                 # 中文格式输入 / Chinese format input
                 chinese_chars = list(self.name)
                 self.name_pinyin_list = [py.lower() for py in PinyinConverter.to_pinyin(self.name)]
-                print(f"中文转拼音 / Chinese to Pinyin: {chinese_chars} -> {self.name_pinyin_list}")
+                if self.verbose:
+                    print(f"中文转拼音 / Chinese to Pinyin: {chinese_chars} -> {self.name_pinyin_list}")
             else:
                 # 纯英文，按字符分割 / Pure English, split by character
                 self.name_pinyin_list = list(self.name.lower())
@@ -274,9 +1072,27 @@ class DictGenerator:
         # 生成各种姓名组合 / Generate various name combinations
         self._generate_name_combinations()
 
+        # 变形在生成时惰性展开，不写入name_combinations / Mutations expand lazily at generation time, not into name_combinations
+        if self.mutation_rules:
+            self.mutator = NameMutator(self.mutation_rules, self.mutation_limit)
+
+        if not self.verbose:
+            return
         print(f"拼音列表 / Pinyin list: {self.name_pinyin_list}")
         print(f"首字母缩写 / Initial abbreviation: {self.name_initials}")
         print(f"姓名组合数量 / Name combinations count: {len(self.name_combinations)}")
+        if self.mutator:
+            print(f"姓名变形规则 / Name mutation rules: {self.mutation_rules} "
+                  f"(每个组合最多 {self.mutation_limit} 个 / up to {self.mutation_limit} per combination)")
+
+    def iter_name_combinations(self):
+        """惰性遍历姓名组合及其变形 / Lazily iterate name combinations and their mutations"""
+        # 以全部基础组合为种子，变形不会重复已有组合 / Seeded with every base combination so mutations never repeat one
+        seen = set(self.name_combinations)
+        for name_combo in self.name_combinations:
+            yield name_combo
+            if self.mutator:
+                yield from self.mutator.variants(name_combo, self.min_length, self.max_length, seen)
 
     def _generate_name_combinations(self):
         """生成各种姓名组合 / Generate various name combinations"""
@@ -354,6 +1170,10 @@ class DictGenerator:
                 self.birthday[6:8],  # 05 (太短，会被过滤)
                 self.birthday[2:6],  # 0312 (太短，会被过滤)
                 self.birthday[4:8],  # 1205 (太短，会被过滤)
+                self.birthday[6:8] + self.birthday[4:6] + self.birthday[0:4],  # 05122003 (DDMMYYYY)
+                self.birthday[4:8] + self.birthday[0:4],  # 12052003 (MMDDYYYY)
+                self.birthday[6:8] + self.birthday[4:6] + self.birthday[2:4],  # 051203 (DDMMYY)
+                self.birthday[6:8] + self.birthday[4:6],  # 0512 (DDMM)
             ]
             # 过滤掉长度不符合要求的生日组合 / Filter birthday combinations that don't meet length requirements
             self.birthday_list = [birth for birth in self.birthday_list if len(birth) >= 4]
@@ -397,375 +1217,415 @@ class DictGenerator:
             # 过滤邮箱组合长度 / Filter email combination lengths
             self.mail_list = [mail for mail in self.mail_list if self.is_valid_length(mail)]
 
+    def iter_numbers(self, token_length):
+        """惰性遍历数字组合，区间按剩余长度下推 / Lazily iterate numbers, ranges pushed down to the remaining length"""
+        for number_list in [self.number_value_1, self.number_value_2,
+                            self.number_value_3, self.number_value_4]:
+            yield from number_list
+
+        for number_range in self.number_ranges:
+            yield from number_range.iter_within(self.min_length - token_length, self.max_length - token_length)
+
+    def count_numbers(self, token_length):
+        """数字组合数量（不生成） / Count number combinations without generating them"""
+        count = sum(len(number_list) for number_list in [self.number_value_1, self.number_value_2,
+                                                          self.number_value_3, self.number_value_4])
+        for number_range in self.number_ranges:
+            count += number_range.count_within(self.min_length - token_length, self.max_length - token_length)
+        return count
+
     def write_dict(self, dict_list):
-        """写入字典文件 / Write to dictionary file"""
+        """流式写入字典文件 / Stream candidates into the dictionary file"""
         if not self.filename:
             return
 
-        valid_passwords = []
-        for item in dict_list:
-            # 只保留长度在6-18位之间的密码 / Only keep passwords with length between 6-18 characters
-            if self.is_valid_length(item):
-                valid_passwords.append(item)
-
-        if valid_passwords:  # 只有当有有效密码时才写入 / Only write when there are valid passwords
-            with open(self.filename, "a", encoding='utf-8') as f:
-                for password in valid_passwords:
-                    f.write(password + '\n')
+        with open(self.filename, "a", encoding='utf-8') as f:
+            if not self.progress:
+                # 只保留长度在6-18位之间的密码 / Only keep passwords with length between 6-18 characters
+                f.writelines(password + '\n' for password in dict_list if self.is_valid_password(password))
+                return
+
+            # 按批写入，每批只计数一次 / Write in batches and count once per batch
+            dict_list = iter(dict_list)
+            while True:
+                batch = list(itertools.islice(dict_list, ProgressReporter.CHUNK_SIZE))
+                if not batch:
+                    break
+                lines = [password + '\n' for password in batch if self.is_valid_password(password)]
+                f.writelines(lines)
+                self.progress.add(len(batch), len(lines), len(''.join(lines).encode('utf-8')))
 
     def name_and_weak(self):
         """姓名与弱口令字段、常用数字组合 - 增强版 / Name with weak passwords and common numbers - Enhanced version"""
-        dict_list = []
-
         # 使用所有姓名组合 / Use all name combinations
-        for name_combo in self.name_combinations:
-            dict_list.append(name_combo)
+        for name_combo in self.iter_name_combinations():
+            if self.policy_allows(name_combo):
+                yield name_combo
 
             # 与弱密码组合 / Combine with weak passwords
             for weak in self.weak_password:
-                dict_list.extend([
-                    name_combo + weak,
-                    weak + name_combo,
-                ])
+                if self.policy_allows(name_combo, weak):
+                    yield name_combo + weak
+                    yield weak + name_combo
 
-            # 与数字组合 / Combine with numbers
-            for number_list in [self.number_value_1, self.number_value_2,
-                                self.number_value_3, self.number_value_4]:
-                for number in number_list:
-                    dict_list.extend([
-                        name_combo + number,
-                        number + name_combo,
-                    ])
-
-        self.write_dict(dict_list)
+            # 与数字组合（无法满足策略时跳过整个数字区间） / Combine with numbers (skip all numbers when the policy can't be met)
+            if self.policy_allows(name_combo, extra_classes=PasswordPolicy.DIGIT):
+                for number in self.iter_numbers(len(name_combo)):
+                    yield name_combo + number
+                    yield number + name_combo
 
     def name_and_birthday_enhanced(self):
         """姓名与生日的增强组合 / Enhanced name and birthday combinations"""
         if not (self.name_combinations and self.birthday):
             return
 
-        dict_list = []
+        weak_list = self.weak_password[:5]  # 进一步限制数量 / Further limit quantity
+        special_classes = self.policy.classes_of(''.join(self.special_chars))
+        weak_classes = self.policy.classes_of(''.join(weak_list))
 
-        for name_combo in self.name_combinations:
+        for name_combo in self.iter_name_combinations():
             for birth_combo in self.birthday_list:
+                # 整对无法满足策略时直接跳过 / Skip the whole pair when no combination can pass the policy
+                if not self.policy_allows(name_combo, birth_combo, extra_classes=special_classes | weak_classes):
+                    continue
+
                 # 基本组合 / Basic combinations
-                dict_list.extend([
-                    name_combo + birth_combo,  # zs20031205
-                    birth_combo + name_combo,  # 20031205zs
-                ])
+                if self.policy_allows(name_combo, birth_combo):
+                    yield name_combo + birth_combo  # zs20031205
+                    yield birth_combo + name_combo  # 20031205zs
 
                 # 带特殊符号的组合 / Combinations with special characters
-                for char in self.special_chars:
-                    dict_list.extend([
-                        name_combo + char + birth_combo,  # zs@20031205
-                        birth_combo + char + name_combo,  # 20031205@zs
-                        name_combo + birth_combo + char,  # zs20031205@
-                        char + name_combo + birth_combo,  # @zs20031205
-                    ])
+                if self.policy_allows(name_combo, birth_combo, extra_classes=special_classes):
+                    for char in self.special_chars:
+                        yield name_combo + char + birth_combo  # zs@20031205
+                        yield birth_combo + char + name_combo  # 20031205@zs
+                        yield name_combo + birth_combo + char  # zs20031205@
+                        yield char + name_combo + birth_combo  # @zs20031205
 
                 # 与弱密码的三元组合 / Three-element combinations with weak passwords
-                for weak in self.weak_password[:5]:  # 进一步限制数量 / Further limit quantity
-                    dict_list.extend([
-                        name_combo + birth_combo + weak,
-                        name_combo + weak + birth_combo,
-                        weak + name_combo + birth_combo,
-                    ])
-
-        self.write_dict(dict_list)
+                for weak in weak_list:
+                    if self.policy_allows(name_combo, birth_combo, weak):
+                        yield name_combo + birth_combo + weak
+                        yield name_combo + weak + birth_combo
+                        yield weak + name_combo + birth_combo
+
+    def token_and_weak(self, token):
+        """单个词元与弱口令 / A single token with weak passwords"""
+        yield token
+        for weak in self.weak_password:
+            yield token + weak
+            yield weak + token
 
     def domain_and_weak(self):
         """域名与弱口令 / Domain with weak passwords"""
-        if not hasattr(self, 'domain_list'):
+        if not self.domain_list:
             return
 
-        dict_list = []
         for domain_i in self.domain_list:
-            dict_list.append(domain_i)
-            for weak in self.weak_password:
-                dict_list.append(domain_i + weak)
-                dict_list.append(weak + domain_i)
-
-        self.write_dict(dict_list)
+            if domain_i not in self.shared_tokens:
+                yield from self.token_and_weak(domain_i)
 
     def mail_and_weak(self):
         """邮箱与弱口令 / Email with weak passwords"""
-        if not hasattr(self, 'mail_list'):
+        if not self.mail_list:
             return
 
-        dict_list = []
         for mail_i in self.mail_list:
-            dict_list.append(mail_i)
-            for weak in self.weak_password:
-                dict_list.append(mail_i + weak)
-                dict_list.append(weak + mail_i)
-
-        self.write_dict(dict_list)
+            if mail_i not in self.shared_tokens:
+                yield from self.token_and_weak(mail_i)
 
     def name_and_domain(self):
         """域名与姓名结合 / Domain and name combinations"""
-        if not (self.name_combinations and hasattr(self, 'domain_list')):
+        if not (self.name_combinations and self.domain_list):
             return
 
-        dict_list = []
         for domain_i in self.domain_list:
-            for name_combo in self.name_combinations:
-                dict_list.extend([name_combo + domain_i, domain_i + name_combo])
-
-        self.write_dict(dict_list)
+            for name_combo in self.iter_name_combinations():
+                yield name_combo + domain_i
+                yield domain_i + name_combo
 
     def birthday_and_weak(self):
         """生日与弱口令字段组合 / Birthday with weak password combinations"""
         if not self.birthday:
             return
 
-        dict_list = []
-
         for birth in self.birthday_list:
-            dict_list.append(birth)
-            for weak in self.weak_password:
-                dict_list.append(birth + weak)
-                dict_list.append(weak + birth)
-
-        self.write_dict(dict_list)
+            if birth not in self.shared_tokens:
+                yield from self.token_and_weak(birth)
 
     def name_and_birthday(self):
         """名称与生日组合 - 保持兼容性 / Name and birthday combinations - Keep compatibility"""
         if not (self.name and self.birthday):
             return
 
-        dict_list = []
         full_name = ''.join(self.name_pinyin_list) if self.name_pinyin_list else self.name
 
         for birth in self.birthday_list:
-            dict_list.append(full_name + birth)
-            dict_list.append(birth + full_name)
+            yield full_name + birth
+            yield birth + full_name
 
             if self.name_ab:
                 for i in self.name_ab:
                     if len(i) >= 2:  # 确保名字缩写至少2位 / Ensure name abbreviation is at least 2 characters
-                        dict_list.append(i + birth)
-                        dict_list.append(birth + i)
-
-        self.write_dict(dict_list)
+                        yield i + birth
+                        yield birth + i
 
     def id_card_and_weak(self):
         """身份证与弱口令 / ID card with weak passwords"""
         if not self.id_card:
             return
 
-        dict_list = []
         # 只保留长度符合要求的身份证片段 / Only keep ID card segments with valid length
         id_segments = [self.id_card[12:], self.id_card[-4:], self.id_card[-6:]]
         valid_segments = [seg for seg in id_segments if self.is_valid_length(seg)]
 
-        dict_list.extend(valid_segments)
+        yield from valid_segments
 
         for weak in self.weak_password:
             for seg in valid_segments:
-                dict_list.append(seg + weak)
-                dict_list.append(weak + seg)
-
-        self.write_dict(dict_list)
+                yield seg + weak
+                yield weak + seg
 
     def id_card_and_name(self):
         """身份证与名称组合 / ID card and name combinations"""
         if not (self.id_card and self.name_combinations):
             return
 
-        dict_list = []
         id_suffix = self.id_card[14:]
 
-        for name_combo in self.name_combinations:
-            dict_list.extend([name_combo + id_suffix, id_suffix + name_combo])
-
-        self.write_dict(dict_list)
+        for name_combo in self.iter_name_combinations():
+            yield name_combo + id_suffix
+            yield id_suffix + name_combo
 
     def phone_number_and_weak(self):
         """手机号与弱口令组合 / Phone number with weak password combinations"""
         if not self.phone_number:
             return
 
-        dict_list = []
         phone_parts = [self.phone_number, self.phone_number[3:], self.phone_number[7:]]
 
         for phone_part in phone_parts:
-            dict_list.append(phone_part)
+            yield phone_part
             for weak in self.weak_password:
-                dict_list.append(phone_part + weak)
-                dict_list.append(weak + phone_part)
-
-        self.write_dict(dict_list)
+                yield phone_part + weak
+                yield weak + phone_part
 
     def phone_number_and_name(self):
         """手机号与名称组合 / Phone number and name combinations"""
         if not (self.phone_number and self.name_combinations):
             return
 
-        dict_list = []
         phone_number_list = [self.phone_number, self.phone_number[7:], self.phone_number[3:]]
 
         for phone_part in phone_number_list:
-            for name_combo in self.name_combinations:
-                dict_list.extend([phone_part + name_combo, name_combo + phone_part])
-
-        self.write_dict(dict_list)
+            for name_combo in self.iter_name_combinations():
+                yield phone_part + name_combo
+                yield name_combo + phone_part
 
     def user_id_and_weak(self):
         """用户ID与弱口令 / User ID with weak passwords"""
         if not self.user_id:
             return
 
-        dict_list = []
-        dict_list.append(self.user_id)
+        yield self.user_id
 
         for weak in self.weak_password:
-            dict_list.append(self.user_id + weak)
-            dict_list.append(weak + self.user_id)
-
-        for number_list in [self.number_value_1, self.number_value_2,
-                            self.number_value_3, self.number_value_4]:
-            for number in number_list:
-                dict_list.append(self.user_id + number)
-                dict_list.append(number + self.user_id)
+            yield self.user_id + weak
+            yield weak + self.user_id
 
-        self.write_dict(dict_list)
+        if self.policy_allows(self.user_id, extra_classes=PasswordPolicy.DIGIT):
+            for number in self.iter_numbers(len(self.user_id)):
+                yield self.user_id + number
+                yield number + self.user_id
 
     def user_id_and_name(self):
         """用户ID与姓名组合 / User ID and name combinations"""
         if not (self.user_id and self.name_combinations):
             return
 
-        dict_list = []
-
-        for name_combo in self.name_combinations:
-            dict_list.extend([name_combo + self.user_id, self.user_id + name_combo])
+        for name_combo in self.iter_name_combinations():
+            yield name_combo + self.user_id
+            yield self.user_id + name_combo
 
         for weak in self.weak_password:
-            for name_combo in self.name_combinations:
-                dict_list.append(name_combo + self.user_id + weak)
-
-        self.write_dict(dict_list)
+            for name_combo in self.iter_name_combinations():
+                yield name_combo + self.user_id + weak
 
     def qq_and_weak(self):
         """QQ和弱密码组合 / QQ and weak password combinations"""
         if not self.qq_number:
             return
 
-        dict_list = []
-        dict_list.append(self.qq_number)
+        yield self.qq_number
 
         for weak in self.weak_password:
-            dict_list.append(self.qq_number + weak)
-            dict_list.append(weak + self.qq_number)
-
-        self.write_dict(dict_list)
+            yield self.qq_number + weak
+            yield weak + self.qq_number
 
     def qq_and_name(self):
         """名称与QQ组合 / Name and QQ combinations"""
         if not (self.qq_number and self.name_combinations):
             return
 
-        dict_list = []
-
-        for name_combo in self.name_combinations:
-            dict_list.extend([name_combo + self.qq_number, self.qq_number + name_combo])
+        for name_combo in self.iter_name_combinations():
+            yield name_combo + self.qq_number
+            yield self.qq_number + name_combo
 
         for weak in self.weak_password:
-            for name_combo in self.name_combinations:
-                dict_list.append(name_combo + self.qq_number + weak)
-
-        self.write_dict(dict_list)
-
-    def generate_dict(self):
-        """生成字典 / Generate dictionary"""
-        # 获取文件名 / Get filename
-        while not self.filename:
-            self.filename = input(
-                '请输入保存字典的文件名 (如: dict.txt) / Please enter filename to save dictionary (e.g., dict.txt): ').strip()
-            if not self.filename:
-                print("文件名不能为空！/ Filename cannot be empty!")
+            for name_combo in self.iter_name_combinations():
+                yield name_combo + self.qq_number + weak
 
-        # 检查文件是否存在 / Check if file exists
-        if os.path.exists(self.filename):
-            choice = input(
-                f"文件 {self.filename} 已存在，是否覆盖？(y/n) / File {self.filename} already exists, overwrite? (y/n): ").lower()
-            if choice != 'y':
-                self.filename = None
-                return self.generate_dict()
-
-        # 清空文件 / Clear file
-        with open(self.filename, "w", encoding='utf-8') as f:
-            pass
-
-        print(f"开始生成字典，保存到文件 / Starting dictionary generation, saving to file: {self.filename}")
-        print(
-            f"密码长度限制: {self.min_length}-{self.max_length} 位 / Password length limit: {self.min_length}-{self.max_length} characters")
+    def phases(self):
+        """按输出顺序列出启用的生成阶段 / List enabled generation phases in output order"""
+        phases = []
 
         # 优先处理姓名相关的组合（放在前面） / Priority processing of name-related combinations (put at the front)
         if self.name:
-            print("生成姓名相关密码... / Generating name-related passwords...")
-            self.name_and_weak()
+            phases.append(("生成姓名相关密码... / Generating name-related passwords...", self.name_and_weak))
 
             if self.birthday:
-                print("生成姓名+生日组合... / Generating name+birthday combinations...")
-                self.name_and_birthday_enhanced()  # 使用增强版 / Use enhanced version
-                self.name_and_birthday()  # 保持兼容性 / Keep compatibility
+                phases.append(("生成姓名+生日组合... / Generating name+birthday combinations...",
+                               self.name_and_birthday_enhanced))  # 使用增强版 / Use enhanced version
+                phases.append((None, self.name_and_birthday))  # 保持兼容性 / Keep compatibility
 
             if self.phone_number:
-                print("生成姓名+手机号组合... / Generating name+phone combinations...")
-                self.phone_number_and_name()
+                phases.append(("生成姓名+手机号组合... / Generating name+phone combinations...", self.phone_number_and_name))
 
-            if hasattr(self, 'domain_list'):
-                print("生成姓名+域名组合... / Generating name+domain combinations...")
-                self.name_and_domain()
+            if self.domain_list:
+                phases.append(("生成姓名+域名组合... / Generating name+domain combinations...", self.name_and_domain))
 
             if self.id_card:
-                print("生成姓名+身份证组合... / Generating name+ID card combinations...")
-                self.id_card_and_name()
+                phases.append(("生成姓名+身份证组合... / Generating name+ID card combinations...", self.id_card_and_name))
 
             if self.user_id:
-                print("生成姓名+用户ID组合... / Generating name+user ID combinations...")
-                self.user_id_and_name()
+                phases.append(("生成姓名+用户ID组合... / Generating name+user ID combinations...", self.user_id_and_name))
 
             if self.qq_number:
-                print("生成姓名+QQ组合... / Generating name+QQ combinations...")
-                self.qq_and_name()
+                phases.append(("生成姓名+QQ组合... / Generating name+QQ combinations...", self.qq_and_name))
 
         # 其他组合 / Other combinations
         if self.birthday:
-            print("生成生日相关密码... / Generating birthday-related passwords...")
-            self.birthday_and_weak()
+            phases.append(("生成生日相关密码... / Generating birthday-related passwords...", self.birthday_and_weak))
 
         if self.id_card:
-            print("生成身份证相关密码... / Generating ID card-related passwords...")
-            self.id_card_and_weak()
+            phases.append(("生成身份证相关密码... / Generating ID card-related passwords...", self.id_card_and_weak))
 
         if self.phone_number:
-            print("生成手机号相关密码... / Generating phone-related passwords...")
-            self.phone_number_and_weak()
+            phases.append(("生成手机号相关密码... / Generating phone-related passwords...", self.phone_number_and_weak))
 
-        if hasattr(self, 'domain_list'):
-            print("生成域名相关密码... / Generating domain-related passwords...")
-            self.domain_and_weak()
+        if self.domain_list:
+            phases.append(("生成域名相关密码... / Generating domain-related passwords...", self.domain_and_weak))
 
-        if hasattr(self, 'mail_list'):
-            print("生成邮箱相关密码... / Generating email-related passwords...")
-            self.mail_and_weak()
+        if self.mail_list:
+            phases.append(("生成邮箱相关密码... / Generating email-related passwords...", self.mail_and_weak))
 
         if self.user_id:
-            print("生成用户ID相关密码... / Generating user ID-related passwords...")
-            self.user_id_and_weak()
+            phases.append(("生成用户ID相关密码... / Generating user ID-related passwords...", self.user_id_and_weak))
 
         if self.qq_number:
-            print("生成QQ相关密码... / Generating QQ-related passwords...")
-            self.qq_and_weak()
+            phases.append(("生成QQ相关密码... / Generating QQ-related passwords...", self.qq_and_weak))
+
+        return phases
+
+    def estimate_keyspace(self):
+        """估算各阶段候选数量（长度和策略过滤前，区间已按长度下推） / Estimate candidates per phase (before length and policy filtering, ranges pushed down)"""
+        names = list(self.iter_name_combinations())
+        weak = len(self.weak_password)
+        token_and_weak = 1 + 2 * weak  # token, token+weak, weak+token
+
+        sizes = {
+            'name_and_weak': lambda: sum(token_and_weak + 2 * self.count_numbers(len(name)) for name in names),
+            'name_and_birthday_enhanced': lambda: len(names) * len(self.birthday_list) * (
+                2 + 4 * len(self.special_chars) + 3 * len(self.weak_password[:5])),
+            'name_and_birthday': lambda: len(self.birthday_list) * (
+                2 + 2 * len([i for i in (self.name_ab or []) if len(i) >= 2])),
+            'phone_number_and_name': lambda: 3 * 2 * len(names),
+            'name_and_domain': lambda: len(self.domain_list) * 2 * len(names),
+            'id_card_and_name': lambda: 2 * len(names),
+            'user_id_and_name': lambda: (2 + weak) * len(names),
+            'qq_and_name': lambda: (2 + weak) * len(names),
+            'birthday_and_weak': lambda: len(self.birthday_list) * token_and_weak,
+            'id_card_and_weak': lambda: token_and_weak * len(
+                [seg for seg in [self.id_card[12:], self.id_card[-4:], self.id_card[-6:]] if self.is_valid_length(seg)]),
+            'phone_number_and_weak': lambda: 3 * token_and_weak,
+            'domain_and_weak': lambda: len(self.domain_list) * token_and_weak,
+            'mail_and_weak': lambda: len(self.mail_list) * token_and_weak,
+            'user_id_and_weak': lambda: token_and_weak + 2 * self.count_numbers(len(self.user_id)),
+            'qq_and_weak': lambda: token_and_weak,
+        }
+        return [(phase.__name__, sizes[phase.__name__]()) for banner, phase in self.phases()]
+
+    def print_keyspace(self):
+        """显示候选数量估算 / Display keyspace estimate"""
+        keyspace = self.estimate_keyspace()
+        print("候选数量估算（去重前） / Keyspace estimate (before deduplication):")
+        for phase_name, count in keyspace:
+            print(f"  {phase_name:<28} {count:>14,}")
+        print(f"  {'total':<28} {sum(count for phase_name, count in keyspace):>14,}")
+
+    def iter_candidates(self, dedupe=True):
+        """按阶段顺序惰性遍历有效候选（未排序） / Lazily iterate valid candidates in phase order (unsorted)"""
+        seen = set()
+        for banner, phase in self.phases():
+            for password in phase():
+                if not self.is_valid_password(password) or password in self.exclude_passwords:
+                    continue
+                if dedupe:
+                    if password in seen:
+                        continue
+                    seen.add(password)
+                yield password
+
+    def build_dict(self):
+        """生成所有阶段并去重（不交互） / Run every phase and deduplicate (non-interactive)"""
+        # 清空文件 / Clear file
+        with open(self.filename, "w", encoding='utf-8') as f:
+            pass
+
+        if self.show_progress:
+            self.progress = ProgressReporter(self.estimate_keyspace())
+
+        for banner, phase in self.phases():
+            if banner:
+                print(banner)
+            if self.progress:
+                sys.stdout.flush()
+                self.progress.start_phase(phase.__name__)
+            self.write_dict(phase())
 
         # 去重和排序 / Remove duplicates and sort
         print("正在去重和排序... / Removing duplicates and sorting...")
         self.remove_duplicates()
 
+    def generate_dict(self):
+        """生成字典 / Generate dictionary"""
+        # 获取文件名 / Get filename
+        while not self.filename:
+            self.filename = input(
+                '请输入保存字典的文件名 (如: dict.txt) / Please enter filename to save dictionary (e.g., dict.txt): ').strip()
+            if not self.filename:
+                print("文件名不能为空！/ Filename cannot be empty!")
+
+        # 检查文件是否存在 / Check if file exists
+        if os.path.exists(self.filename):
+            choice = input(
+                f"文件 {self.filename} 已存在，是否覆盖？(y/n) / File {self.filename} already exists, overwrite? (y/n): ").lower()
+            if choice != 'y':
+                self.filename = None
+                return self.generate_dict()
+
+        print(f"开始生成字典，保存到文件 / Starting dictionary generation, saving to file: {self.filename}")
+        print(
+            f"密码长度限制: {self.min_length}-{self.max_length} 位 / Password length limit: {self.min_length}-{self.max_length} characters")
+
+        self.build_dict()
+
         print(f"字典生成完成！文件保存为 / Dictionary generation completed! File saved as: {self.filename}")
 
+        if self.hash_algorithms:
+            print(f"正在计算哈希 ({self.hash_workers} 个进程)... / Hashing candidates ({self.hash_workers} processes)...")
+            self.write_hash_tables()
+
         # 显示统计信息 / Display statistics
         try:
             with open(self.filename, 'r', encoding='utf-8') as f:
@@ -782,6 +1642,152 @@ class DictGenerator:
         except Exception as e:
             print(f"无法读取生成的文件 / Cannot read generated file: {e}")
 
+    def write_hash_tables(self):
+        """多进程批量计算哈希，写出按哈希排序的二进制表 / Hash candidates in multi-process batches and write hash-sorted tables"""
+        records = {algorithm: [] for algorithm in self.hash_algorithms}
+
+        with open(self.filename, 'r', encoding='utf-8') as f, multiprocessing.Pool(self.hash_workers) as pool:
+            batches = iter(lambda: [line.rstrip('\n') for line in itertools.islice(f, HASH_BATCH_SIZE)], [])
+            jobs = ((self.hash_algorithms, batch) for batch in batches)
+            for batch_records in pool.imap_unordered(_hash_batch, jobs):
+                for algorithm, algorithm_records in batch_records.items():
+                    records[algorithm].extend(algorithm_records)
+
+        for algorithm, algorithm_records in records.items():
+            path = f"{self.filename}.{algorithm}.bin"
+            write_hash_table(path, algorithm, algorithm_records)
+            print(f"哈希表已保存 / Hash table saved: {path} ({len(algorithm_records)} 条记录 / records)")
+
+    def lookup_hashes(self):
+        """在哈希表中查找哈希文件里的哈希 / Look up the hashes of a file in a hash table"""
+        total = 0
+        found = 0
+
+        with HashTable(self.lookup_table) as table, open(self.lookup_file, 'r', encoding='utf-8') as f:
+            print(f"哈希表 / Hash table: {self.lookup_table} ({table.algorithm}, {table.count} 条记录 / records)")
+            for line in f:
+                hash_hex = line.strip().lower()
+                if not hash_hex:
+                    continue
+                try:
+                    digest = bytes.fromhex(hash_hex)
+                except ValueError:
+                    print(f"跳过无效哈希 / Skipping invalid hash: {hash_hex}")
+                    continue
+                total += 1
+
+                matches = table.find(digest)
+                if matches:
+                    found += 1
+                    for password in matches:
+                        print(f"{hash_hex}:{password}")
+
+        print(f"命中 {found}/{total} 个哈希 / Matched {found}/{total} hashes")
+
+    def shared_token_set(self):
+        """与目标无关、可跨目标共享的词元 / Target-independent tokens that can be shared across targets"""
+        return set(self.domain_list) | set(self.mail_list) | set(self.birthday_list)
+
+    def batch_target(self):
+        """创建继承全局生成选项的目标生成器 / Create a target generator inheriting the global generation options"""
+        target = DictGenerator()
+        target.min_length = self.min_length
+        target.max_length = self.max_length
+        target.mutation_rules = list(self.mutation_rules)
+        target.mutation_limit = self.mutation_limit
+        target.number_ranges = list(self.number_ranges)
+        target.policy = copy.deepcopy(self.policy)  # 各目标独立 / Independent per target
+        target.show_progress = self.show_progress
+        return target
+
+    def run_batch(self):
+        """批量生成：共享候选集只生成一次并存入SQLite索引 / Batch generation: shared candidate sets are built once and indexed in SQLite"""
+        os.makedirs(self.batch_dir, exist_ok=True)
+
+        # 读取并处理所有目标 / Read and process every target
+        targets = []
+        with open(self.batch_file, 'r', encoding='utf-8') as f:
+            for line in f:
+                line = line.strip()
+                if not line or line.startswith('#'):
+                    continue
+                target = self.batch_target()  # 全局选项 / Global options
+                try:
+                    target.parse_args(shlex.split(line), target_only=True)  # 目标信息 / Target information
+                    if not target.profile():
+                        print(f"跳过没有目标信息的行 / Skipping line without target information: {line}")
+                        continue
+                    target.process_profile()
+                except ValueError as e:
+                    print(f"跳过无效的行 / Skipping invalid line: {line} ({e})")
+                    continue
+                targets.append((line, target))
+
+        # 被两个及以上目标使用的词元组成共享集 / Tokens used by two or more targets become shared sets
+        usage_count = {}
+        for line, target in targets:
+            for token in target.shared_token_set():
+                usage_count[token] = usage_count.get(token, 0) + 1
+        shared_tokens = sorted(token for token, count in usage_count.items() if count >= 2)
+
+        index_path = os.path.join(self.batch_dir, "shared.sqlite")
+        if os.path.exists(index_path):
+            os.remove(index_path)
+        db = sqlite3.connect(index_path)
+        db.executescript("""
+            CREATE TABLE shared_sets (id INTEGER PRIMARY KEY, token TEXT UNIQUE, filename TEXT, size INTEGER);
+            CREATE TABLE candidates (set_id INTEGER, password TEXT, PRIMARY KEY (set_id, password)) WITHOUT ROWID;
+            CREATE TABLE targets (id INTEGER PRIMARY KEY, line TEXT, filename TEXT, size INTEGER);
+            CREATE TABLE target_sets (target_id INTEGER, set_id INTEGER, PRIMARY KEY (target_id, set_id));
+        """)
+
+        # 共享集只生成一次 / Each shared set is generated once
+        shared_sets = {}
+        for set_id, token in enumerate(shared_tokens, 1):
+            passwords = sorted(set(password for password in self.token_and_weak(token) if self.is_valid_password(password)),
+                               key=lambda x: (len(x), x.lower()))
+            filename = f"shared_{set_id:03d}.txt"
+            with open(os.path.join(self.batch_dir, filename), 'w', encoding='utf-8') as f:
+                f.writelines(password + '\n' for password in passwords)
+            db.execute("INSERT INTO shared_sets VALUES (?, ?, ?, ?)", (set_id, token, filename, len(passwords)))
+            db.executemany("INSERT INTO candidates VALUES (?, ?)", ((set_id, password) for password in passwords))
+            shared_sets[token] = (set_id, filename, set(passwords))
+        print(f"共享候选集 / Shared candidate sets: {len(shared_sets)} "
+              f"({sum(len(passwords) for _, _, passwords in shared_sets.values())} 个候选 / candidates)")
+
+        # 每个目标只写出独有的候选，并引用共享集 / Each target only holds its unique candidates plus references to shared sets
+        total_unique = 0
+        total_shared = 0
+        for target_id, (line, target) in enumerate(targets, 1):
+            target.filename = os.path.join(self.batch_dir, f"target_{target_id:03d}.txt")
+            target.shared_tokens = target.shared_token_set() & shared_sets.keys()
+            referenced = [shared_sets[token] for token in sorted(target.shared_tokens)]
+            for set_id, filename, passwords in referenced:
+                target.exclude_passwords |= passwords
+
+            print(f"[{target_id}/{len(targets)}] {line} -> {target.filename}")
+            target.build_dict()
+
+            with open(target.filename, 'r', encoding='utf-8') as f:
+                size = sum(1 for _ in f)
+            with open(target.filename + ".shared", 'w', encoding='utf-8') as f:
+                f.writelines(filename + '\n' for set_id, filename, passwords in referenced)
+
+            db.execute("INSERT INTO targets VALUES (?, ?, ?, ?)", (target_id, line, target.filename, size))
+            db.executemany("INSERT INTO target_sets VALUES (?, ?)",
+                           ((target_id, set_id) for set_id, filename, passwords in referenced))
+            total_unique += size
+            total_shared += sum(len(passwords) for set_id, filename, passwords in referenced)
+
+        db.commit()
+        db.close()
+
+        print(f"批量生成完成 / Batch generation completed: {len(targets)} 个目标 / targets, 索引 / index: {index_path}")
+        # 共享集每个只写一次，节省的是其余目标的重复行 / Each shared set is written once, the saving is every other target's copy
+        saved = total_shared - sum(len(passwords) for set_id, filename, passwords in shared_sets.values())
+        print(f"目标独有候选 {total_unique} 个，共享集节省 {saved} 行 / "
+              f"{total_unique} unique target candidates, {saved} lines saved by shared sets")
+
     def remove_duplicates(self):
         """去除重复项并按长度和字母顺序排序 / Remove duplicates and sort by length and alphabetical order"""
         try:
@@ -791,11 +1797,18 @@ class DictGenerator:
             # 去重并再次验证长度 / Remove duplicates and verify length again
             unique_lines = []
             seen = set()
-            for line in lines:
+            for index, line in enumerate(lines):
                 password = line.strip()
-                if password and self.is_valid_length(password) and password not in seen:
+                if (password and self.is_valid_password(password) and password not in seen
+                        and password not in self.exclude_passwords):
                     unique_lines.append(password)
                     seen.add(password)
+                # 每4096行才检查一次进度 / Check progress only every 4096 lines
+                if self.progress and not index & 0xfff:
+                    self.progress.dedup(index + 1, len(unique_lines), len(lines))
+
+            if self.progress:
+                self.progress.dedup(len(lines), len(unique_lines), len(lines), force=True)
 
             # 排序：先按长度，再按字母顺序 / Sort: first by length, then alphabetically
             unique_lines.sort(key=lambda x: (len(x), x.lower()))
@@ -804,6 +1817,10 @@ class DictGenerator:
                 for line in unique_lines:
                     f.write(line + '\n')
 
+            if self.progress:
+                self.progress.finish(len(unique_lines))
+                self.progress = None
+
         except Exception as e:
             print(f"去重时发生错误 / Error during deduplication: {e}")
 
@@ -812,18 +1829,35 @@ class DictGenerator:
         try:
             self.parse_args()
 
+            # 服务模式由请求提供目标信息 / Service mode takes target information from requests
+            if self.serve_address:
+                serve(self.serve_address, self.cache_size)
+                return
+
+            # 批量模式从文件读取目标信息 / Batch mode reads target information from a file
+            if self.batch_file:
+                self.run_batch()
+                return
+
+            # 哈希查找模式不需要目标信息 / Hash lookup mode needs no target information
+            if self.lookup_file or self.lookup_table:
+                if not (self.lookup_file and self.lookup_table):
+                    raise ValueError('--lookup 和 --table 必须同时指定 / --lookup and --table must be given together')
+                self.lookup_hashes()
+                return
+
             # 检查是否有输入参数 / Check if any parameters are provided
-            if not any([self.name, self.birthday, self.id_card, self.mail,
-                        self.domain, self.phone_number, self.qq_number, self.user_id]):
+            if not self.profile():
                 print("错误: 请至少提供一个参数 / Error: Please provide at least one parameter")
                 usage()
                 sys.exit(1)
 
             # 处理各种信息 / Process various information
-            self.process_name()
-            self.process_birthday()
-            self.process_domain()
-            self.process_mail()
+            self.process_profile()
+
+            if self.estimate_only:
+                self.print_keyspace()
+                return
 
             # 生成字典 / Generate dictionary
             self.generate_dict()
@@ -833,6 +1867,165 @@ class DictGenerator:
             sys.exit(1)
 
 
+def generate(profile, dedupe=True, **opts):
+    """库接口：按目标信息惰性生成候选 / Library API: lazily generate candidates for a profile
+
+    profile 为 Profile 或字段字典 / profile is a Profile or a dict of its fields
+    opts 同 DictGenerator.configure / opts as in DictGenerator.configure
+
+    >>> for password in generate(Profile(name='zhang,san', birthday='20031205'), policy='digit'):
+    ...     pass
+    """
+    if isinstance(profile, dict):
+        profile = Profile(**profile)
+    return DictGenerator.from_profile(profile, **opts).iter_candidates(dedupe)
+
+
+class GenerationService:
+    """本地生成服务：LRU缓存处理后的生成器 / Local generation service with an LRU cache of processed generators"""
+
+    def __init__(self, cache_size=128, chunk_lines=4096):
+        self.cache_size = cache_size
+        self.chunk_lines = chunk_lines  # 每个响应块的候选数量 / Candidates per response chunk
+        self.cache = collections.OrderedDict()
+        self.lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def generator_for(self, profile, options):
+        """取缓存的生成器，未命中时处理目标信息 / Return the cached generator, processing the profile on a miss"""
+        key = (profile, json.dumps(options, sort_keys=True))
+        with self.lock:
+            generator = self.cache.get(key)
+            if generator is not None:
+                self.cache.move_to_end(key)
+                self.hits += 1
+                return generator
+            self.misses += 1
+
+        # 在锁外处理，避免阻塞其他请求 / Process outside the lock so other requests are not blocked
+        generator = DictGenerator.from_profile(profile, **options)
+        with self.lock:
+            self.cache[key] = generator
+            while len(self.cache) > self.cache_size:
+                self.cache.popitem(last=False)
+        return generator
+
+    def stream(self, request):
+        """按块惰性生成响应内容 / Lazily yield response chunks"""
+        if not isinstance(request, dict):
+            raise ValueError('请求应为JSON对象 / Request should be a JSON object')
+        fields, options = request.get('profile', {}), request.get('options', {})
+        if not isinstance(fields, dict) or not isinstance(options, dict):
+            raise ValueError('profile 和 options 应为JSON对象 / profile and options should be JSON objects')
+        profile = Profile(**fields)
+        if not profile:
+            raise ValueError('请至少提供一个目标信息 / Please provide at least one profile field')
+        generator = self.generator_for(profile, options)
+        candidates = generator.iter_candidates(request.get('dedupe', True))
+
+        while True:
+            chunk = list(itertools.islice(candidates, self.chunk_lines))
+            if not chunk:
+                return
+            yield ('\n'.join(chunk) + '\n').encode('utf-8')
+
+    def stats(self):
+        with self.lock:
+            return {'cached': len(self.cache), 'cache_size': self.cache_size, 'hits': self.hits, 'misses': self.misses}
+
+
+class GenerationRequestHandler(http.server.BaseHTTPRequestHandler):
+    """生成服务HTTP接口 / HTTP interface of the generation service
+
+    POST /generate  {"profile": {...}, "options": {...}, "dedupe": true} -> 分块返回候选 / chunked candidates
+    GET  /stats     缓存统计 / cache statistics
+    """
+
+    protocol_version = 'HTTP/1.1'  # 分块传输需要HTTP/1.1 / Chunked transfer needs HTTP/1.1
+    service = None
+
+    def address_string(self):
+        # Unix套接字没有客户端地址 / Unix sockets have no client address
+        return self.client_address[0] if self.client_address else 'unix'
+
+    def _send_json(self, status, payload):
+        body = json.dumps(payload, ensure_ascii=False).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json; charset=utf-8')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        if self.path == '/stats':
+            self._send_json(200, self.service.stats())
+        else:
+            self._send_json(404, {'error': 'not found'})
+
+    def do_POST(self):
+        if self.path != '/generate':
+            self._send_json(404, {'error': 'not found'})
+            return
+
+        try:
+            request = json.loads(self.rfile.read(int(self.headers.get('Content-Length', 0))) or b'{}')
+            chunks = self.service.stream(request)
+            first_chunk = next(chunks, b'')  # 先取一块以便尽早报告参数错误 / Pull one chunk so option errors surface as 400
+        except (ValueError, TypeError) as e:
+            self._send_json(400, {'error': str(e)})
+            return
+
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/plain; charset=utf-8')
+        self.send_header('Transfer-Encoding', 'chunked')
+        self.end_headers()
+        try:
+            for chunk in itertools.chain([first_chunk] if first_chunk else [], chunks):
+                self.wfile.write(b'%x\r\n%s\r\n' % (len(chunk), chunk))
+            self.wfile.write(b'0\r\n\r\n')
+        except (BrokenPipeError, ConnectionResetError):
+            self.close_connection = True  # 客户端提前断开 / Client disconnected early
+
+
+class ThreadingHTTPServer(socketserver.ThreadingMixIn, http.server.HTTPServer):
+    daemon_threads = True
+
+
+class ThreadingUnixHTTPServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    daemon_threads = True
+
+
+def serve(address, cache_size=128):
+    """启动本地生成服务 (host:port 或 unix:/path) / Start the local generation service (host:port or unix:/path)"""
+    # 预热拼音表 / Warm up the pinyin tables
+    PinyinConverter.to_pinyin('张三')
+    GenerationRequestHandler.service = GenerationService(cache_size)
+
+    socket_path = None
+    if address.startswith('unix:'):
+        socket_path = address[5:]
+        if os.path.exists(socket_path):
+            os.remove(socket_path)
+        server = ThreadingUnixHTTPServer(socket_path, GenerationRequestHandler)
+    else:
+        host, _, port = address.rpartition(':')
+        if not port.isdigit():
+            raise ValueError(f'服务地址格式错误，应为 host:port 或 unix:/path / Address format error, '
+                             f'should be host:port or unix:/path: {address}')
+        server = ThreadingHTTPServer((host or '127.0.0.1', int(port)), GenerationRequestHandler)
+
+    print(f"生成服务已启动 / Generation service listening on: {address} (Ctrl+C 停止 / to stop)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        if socket_path and os.path.exists(socket_path):
+            os.remove(socket_path)
+
+
 if __name__ == "__main__":
     print("密码字典生成器 / Password Dictionary Generator")
     print("仅用于教育和授权的安全测试目的 / For educational and authorized security testing purposes only")